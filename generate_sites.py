@@ -7,17 +7,30 @@ Usage::
 
     python generate_sites.py
 
-The command regenerates ``docs/`` from the current CSV content.
+The command regenerates ``docs/`` from the current CSV content. Installing
+``pyarrow`` enables a faster CSV reader; the standard library is used
+otherwise.
 """
 
 from __future__ import annotations
 
 import csv
 import html
+import io
+import os
 import re
+import sys
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from string import Template
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+try:
+    import pyarrow as pa  # type: ignore[import-untyped,import-not-found]
+    import pyarrow.csv as pac  # type: ignore[import-untyped,import-not-found]
+except ImportError:  # pyarrow is optional; the stdlib csv module is the fallback.
+    pa = pac = None
 
 
 ROOT = Path(__file__).parent
@@ -25,77 +38,190 @@ DATA_FILE = ROOT / "google-2025-12-28.csv"
 DETAIL_FILE = ROOT / "寵物美容detail.csv"
 DOCS_DIR = ROOT / "docs"
 ASSETS_DIR = DOCS_DIR / "assets"
+STORES_DIR = DOCS_DIR / "stores"
+
+# Export columns read by load_shops, which looks each one up by name.
+OPTION_COLUMNS = ("ah5Ghc", "M4A5Cf", "ah5Ghc (2)")
+SHOP_COLUMNS = (
+    "hfpxzc href",
+    "qBF1Pd",
+    "MW4etd",
+    "UY7F9",
+    "W4Efsd",
+    "W4Efsd (3)",
+    "W4Efsd (4)",
+    "W4Efsd (5)",
+    "lcr4fd href",
+    "UsdlK",
+) + OPTION_COLUMNS
+
+SLUG_INVALID_CHARS = re.compile(r"[^\w\s-]")
+SLUG_SEPARATORS = re.compile(r"[-\s]+")
+
+
+def _slug_ascii_table() -> Dict[int, Optional[str]]:
+    # ASCII equivalent of SLUG_INVALID_CHARS + SLUG_SEPARATORS: drop what the
+    # first pattern removes and turn whitespace into dashes.
+    table: Dict[int, Optional[str]] = {}
+    for code in range(128):
+        char = chr(code)
+        if char.isspace():
+            table[code] = "-"
+        elif not (char.isalnum() or char in "_-"):
+            table[code] = None
+    return table
+
+
+SLUG_ASCII_TABLE = _slug_ascii_table()
 
 
 def slugify(name: str) -> str:
     """Create a URL-friendly slug while keeping non-Latin characters."""
 
-    normalized = unicodedata.normalize("NFKC", name).strip()
-    normalized = re.sub(r"[^\w\s-]", "", normalized)
-    normalized = re.sub(r"[-\s]+", "-", normalized)
+    if name.isascii():
+        # NFKC leaves ASCII unchanged, and one translate() pass replaces both
+        # regular expressions.
+        normalized = name.translate(SLUG_ASCII_TABLE)
+        while "--" in normalized:
+            normalized = normalized.replace("--", "-")
+    else:
+        normalized = unicodedata.normalize("NFKC", name).strip()
+        normalized = SLUG_INVALID_CHARS.sub("", normalized)
+        normalized = SLUG_SEPARATORS.sub("-", normalized)
     return normalized.strip("-")
 
 
+def unique_slug(name: str, counters: Dict[str, int]) -> str:
+    """Return a slug for ``name`` that is not yet a key of ``counters``.
+
+    ``counters`` maps every slug handed out so far to the next numeric suffix
+    to try for it, so repeated names resume where the last duplicate stopped
+    instead of probing from ``-2`` again.
+    """
+
+    slug_base = slugify(name) or "shop"
+    slug = slug_base
+    counter = counters.get(slug_base)
+    if counter is not None:
+        slug = f"{slug_base}-{counter}"
+        while slug in counters:
+            counter += 1
+            slug = f"{slug_base}-{counter}"
+        counters[slug_base] = counter + 1
+    counters[slug] = 2
+    return slug
+
+
 def clean_field(value: str) -> str:
     return value.replace("⋅", "").replace("·", "").strip()
 
 
+def csv_rows(path: Path) -> Iterator[List[str]]:
+    """Return a reader over the rows of a CSV export, header included."""
+
+    # One read() for the whole file; exports may start with a BOM.
+    raw = path.read_bytes().decode("utf-8").lstrip("\ufeff")
+    return csv.reader(io.StringIO(raw))
+
+
+def read_columns(path: Path, names: Sequence[str]) -> List[List[str]]:
+    """Return the named CSV columns as lists of strings.
+
+    Uses pyarrow's multithreaded parser when it is installed and falls back
+    to the standard library otherwise. Missing columns and cells read as
+    empty strings.
+    """
+
+    if pac is not None:
+        try:
+            table = pac.read_csv(
+                path,
+                parse_options=pac.ParseOptions(delimiter=",", newlines_in_values=True),
+                convert_options=pac.ConvertOptions(
+                    column_types={name: pa.string() for name in names},
+                    include_columns=list(names),
+                    include_missing_columns=True,
+                ),
+            )
+        except pa.ArrowInvalid:
+            # pyarrow rejects rows shorter than the header; the stdlib reader
+            # below pads them instead.
+            pass
+        else:
+            return [[value or "" for value in table.column(name).to_pylist()] for name in names]
+
+    reader = csv_rows(path)
+    header = next(reader, [])
+    positions = {name: idx for idx, name in enumerate(header)}
+    # Missing columns resolve to an index no row can reach.
+    indices = [positions.get(name, sys.maxsize) for name in names]
+    columns: List[List[str]] = [[] for _ in names]
+    for row in reader:
+        size = len(row)
+        for idx, values in zip(indices, columns):
+            values.append(row[idx] if idx < size else "")
+    return columns
+
+
 def load_images() -> Dict[str, str]:
     image_map: Dict[str, str] = {}
-    with DETAIL_FILE.open(encoding="utf-8") as detail_fp:
-        reader = csv.reader(detail_fp)
-        header = next(reader, [])
-        for row in reader:
-            if len(row) < 2:
-                continue
-            link, image = row[0].strip(), row[1].strip()
-            if link:
-                image_map[link] = image
+    reader = csv_rows(DETAIL_FILE)
+    next(reader, [])
+    for row in reader:
+        if len(row) < 2:
+            continue
+        link, image = row[0].strip(), row[1].strip()
+        if link:
+            image_map[link] = image
     return image_map
 
 
 def load_shops() -> List[dict]:
-    with DATA_FILE.open(encoding="utf-8") as data_fp:
-        reader = csv.reader(data_fp)
-        header = next(reader, [])
-        rows = list(reader)
+    columns = dict(zip(SHOP_COLUMNS, read_columns(DATA_FILE, SHOP_COLUMNS)))
 
     image_map = load_images()
     shops: List[dict] = []
-    used_slugs: set[str] = set()
-
-    for row in rows:
-        if not row or len(row) < 3:
-            continue
-
-        record = {header[idx]: (row[idx].strip() if idx < len(row) else "") for idx in range(len(header))}
-        map_url = record.get("hfpxzc href", "")
-        name = record.get("qBF1Pd", "")
+    slug_counters: Dict[str, int] = {}
+
+    rows = zip(
+        columns["hfpxzc href"],
+        columns["qBF1Pd"],
+        columns["MW4etd"],
+        columns["UY7F9"],
+        columns["W4Efsd"],
+        columns["W4Efsd (3)"],
+        columns["W4Efsd (4)"],
+        columns["W4Efsd (5)"],
+        columns["lcr4fd href"],
+        columns["UsdlK"],
+        zip(*(columns[key] for key in OPTION_COLUMNS)),
+    )
+    for map_url, name, rating, reviews, category, address, status, opening, website, phone, option_values in rows:
+        map_url = map_url.strip()
+        name = name.strip()
         if not map_url or not name:
             continue
 
-        rating = record.get("MW4etd", "")
-        reviews = clean_field(record.get("UY7F9", "").strip("()"))
-        category = record.get("W4Efsd", "")
-        address = record.get("W4Efsd (3)", "")
-        status = clean_field(record.get("W4Efsd (4)", ""))
-        opening = clean_field(record.get("W4Efsd (5)", ""))
-        website = record.get("lcr4fd href", "")
-        phone = clean_field(record.get("UsdlK", ""))
+        rating = rating.strip()
+        reviews = reviews.strip().strip("()")
+        if not reviews.isdigit():
+            # Plain counts like "62" are already clean; only odd values pay
+            # for the separator cleanup.
+            reviews = clean_field(reviews)
+        category = category.strip()
+        address = address.strip()
+        status = clean_field(status)
+        opening = clean_field(opening)
+        website = website.strip()
+        phone = clean_field(phone)
 
         options = []
-        for key in ("ah5Ghc", "M4A5Cf", "ah5Ghc (2)"):
-            value = clean_field(record.get(key, ""))
+        for value in option_values:
+            value = clean_field(value)
             if value:
                 options.append(value)
 
-        slug_base = slugify(name) or "shop"
-        slug = slug_base
-        counter = 2
-        while slug in used_slugs:
-            slug = f"{slug_base}-{counter}"
-            counter += 1
-        used_slugs.add(slug)
+        slug = unique_slug(name, slug_counters)
 
         shops.append(
             {
@@ -118,51 +244,26 @@ def load_shops() -> List[dict]:
     return shops
 
 
-def render_shop_page(shop: dict) -> str:
-    image_section = (
-        f'<div class="hero" style="background-image: url({html.escape(shop["image"])});"></div>'
-        if shop.get("image")
-        else "<div class=\"hero placeholder\">本店家尚未提供照片</div>"
-    )
+def escape_shop(shop: dict) -> dict:
+    """Return a copy of ``shop`` with every text field HTML-escaped.
 
-    options_list = "".join(f"<li>{html.escape(option)}</li>" for option in shop.get("options", []))
-    options_block = (
-        f"<section><h2>服務選項</h2><ul class=\"pill-list\">{options_list}</ul></section>" if options_list else ""
-    )
+    The render functions expect this view and interpolate it verbatim.
+    """
 
-    details = []
-    for label, key in (
-        ("評分", "rating"),
-        ("評論數", "reviews"),
-        ("分類", "category"),
-        ("地址", "address"),
-        ("電話", "phone"),
-        ("營業資訊", "opening"),
-        ("目前狀態", "status"),
-    ):
-        value = shop.get(key, "")
-        if value:
-            details.append(f"<li><span class=\"label\">{label}</span><span class=\"value\">{html.escape(value)}</span></li>")
+    escaped: dict = {key: html.escape(value) for key, value in shop.items() if isinstance(value, str)}
+    escaped["slug"] = shop["slug"]
+    escaped["options"] = [html.escape(option) for option in shop.get("options", [])]
+    return escaped
 
-    website_link = (
-        f"<a class=\"button secondary\" href=\"{html.escape(shop['website'])}\" target=\"_blank\" rel=\"noopener noreferrer\">官方網站</a>"
-        if shop.get("website")
-        else ""
-    )
 
-    map_link = (
-        f"<a class=\"button\" href=\"{html.escape(shop['map_url'])}\" target=\"_blank\" rel=\"noopener noreferrer\">在地圖上查看</a>"
-        if shop.get("map_url")
-        else ""
-    )
-
-    return f"""
+SHOP_PAGE_TEMPLATE = Template(
+    """
 <!DOCTYPE html>
 <html lang="zh-Hant">
 <head>
   <meta charset="UTF-8" />
   <meta name="viewport" content="width=device-width, initial-scale=1" />
-  <title>{html.escape(shop['name'])} ｜ 寵物美容</title>
+  <title>${name} ｜ 寵物美容</title>
   <link rel="preconnect" href="https://fonts.googleapis.com">
   <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
   <link href="https://fonts.googleapis.com/css2?family=Noto+Sans+TC:wght@400;500;700&display=swap" rel="stylesheet">
@@ -172,52 +273,103 @@ def render_shop_page(shop: dict) -> str:
   <header class="page-header">
     <div>
       <a class="back-link" href="../../index.html">← 返回所有店家</a>
-      <h1>{html.escape(shop['name'])}</h1>
+      <h1>${name}</h1>
       <p class="subtitle">為您找到最適合的寵物美容夥伴</p>
     </div>
     <div class="cta-group">
-      {map_link}
-      {website_link}
+      ${map_link}
+      ${website_link}
     </div>
   </header>
 
-  {image_section}
+  ${image_section}
 
   <main class="content">
     <section class="card">
       <h2>店家資訊</h2>
       <ul class="details">
-        {''.join(details)}
+        ${details}
       </ul>
     </section>
 
-    {options_block}
+    ${options_block}
   </main>
 
   <footer class="footer">資料來源：Google 地圖；圖片來源：店家公開照片。</footer>
 </body>
 </html>
 """
+)
 
+SHOP_DETAIL_FIELDS = (
+    ("評分", "rating"),
+    ("評論數", "reviews"),
+    ("分類", "category"),
+    ("地址", "address"),
+    ("電話", "phone"),
+    ("營業資訊", "opening"),
+    ("目前狀態", "status"),
+)
 
-def render_index(shops: List[dict]) -> str:
-    cards = []
-    for shop in shops:
-        image_style = f"style=\"background-image: url({html.escape(shop['image'])});\"" if shop.get("image") else ""
-        card = f"""
-      <a class="card shop-card" href="stores/{shop['slug']}/index.html">
-        <div class="thumb" {image_style}></div>
+
+def render_shop_page(shop: dict) -> str:
+    image_section = (
+        f'<div class="hero" style="background-image: url({shop["image"]});"></div>'
+        if shop.get("image")
+        else "<div class=\"hero placeholder\">本店家尚未提供照片</div>"
+    )
+
+    options_block = ""
+    if shop.get("options"):
+        parts = ['<section><h2>服務選項</h2><ul class="pill-list">']
+        for option in shop["options"]:
+            parts += ["<li>", option, "</li>"]
+        parts.append("</ul></section>")
+        options_block = "".join(parts)
+
+    details = []
+    for label, key in SHOP_DETAIL_FIELDS:
+        value = shop.get(key, "")
+        if value:
+            details += ['<li><span class="label">', label, '</span><span class="value">', value, "</span></li>"]
+
+    website_link = (
+        f"<a class=\"button secondary\" href=\"{shop['website']}\" target=\"_blank\" rel=\"noopener noreferrer\">官方網站</a>"
+        if shop.get("website")
+        else ""
+    )
+
+    map_link = (
+        f"<a class=\"button\" href=\"{shop['map_url']}\" target=\"_blank\" rel=\"noopener noreferrer\">在地圖上查看</a>"
+        if shop.get("map_url")
+        else ""
+    )
+
+    return SHOP_PAGE_TEMPLATE.substitute(
+        name=shop["name"],
+        map_link=map_link,
+        website_link=website_link,
+        image_section=image_section,
+        details="".join(details),
+        options_block=options_block,
+    )
+
+
+CARD_TEMPLATE = Template(
+    """
+      <a class="card shop-card" href="stores/${slug}/index.html">
+        <div class="thumb" ${image_style}></div>
         <div class="card-body">
-          <h2>{html.escape(shop['name'])}</h2>
-          <p class="meta">{html.escape(shop.get('category', ''))}</p>
-          <p class="meta">⭐ {html.escape(shop.get('rating', ''))}（{html.escape(shop.get('reviews', '0'))} 則評論）</p>
-          <p class="address">{html.escape(shop.get('address', ''))}</p>
+          <h2>${name}</h2>
+          <p class="meta">${category}</p>
+          <p class="meta">⭐ ${rating}（${reviews} 則評論）</p>
+          <p class="address">${address}</p>
         </div>
       </a>
 """
-        cards.append(card)
+)
 
-    return f"""
+INDEX_HEAD_BYTES = """
 <!DOCTYPE html>
 <html lang="zh-Hant">
 <head>
@@ -236,20 +388,45 @@ def render_index(shops: List[dict]) -> str:
       <h1>寵物美容店家專屬頁面</h1>
       <p class="subtitle">每間店家都擁有獨立介紹頁，讓飼主快速找到理想的美容夥伴。</p>
     </div>
-    <div class="pill">共 {len(shops)} 間店家</div>
+    <div class="pill">共 """.encode("utf-8")
+INDEX_GRID_BYTES = """ 間店家</div>
   </header>
 
-  <main class="grid">{''.join(cards)}</main>
+  <main class="grid">""".encode("utf-8")
+INDEX_FOOTER_BYTES = """</main>
 
   <footer class="footer">資料來源：Google 地圖；圖片來源：店家公開照片。</footer>
 </body>
 </html>
-"""
+""".encode("utf-8")
+
+
+def render_card(shop: dict) -> str:
+    image_style = f"style=\"background-image: url({shop['image']});\"" if shop.get("image") else ""
+    return CARD_TEMPLATE.substitute(
+        slug=shop["slug"],
+        image_style=image_style,
+        name=shop["name"],
+        category=shop.get("category", ""),
+        rating=shop.get("rating", ""),
+        reviews=shop.get("reviews", "0"),
+        address=shop.get("address", ""),
+    )
 
 
-def write_style() -> None:
-    ASSETS_DIR.mkdir(parents=True, exist_ok=True)
-    style = """
+def render_index(shops: List[dict]) -> bytearray:
+    """Return the UTF-8 encoded index page, built from pre-encoded fragments."""
+
+    page = bytearray(INDEX_HEAD_BYTES)
+    page += str(len(shops)).encode("ascii")
+    page += INDEX_GRID_BYTES
+    for shop in shops:
+        page += render_card(shop).encode("utf-8")
+    page += INDEX_FOOTER_BYTES
+    return page
+
+
+STYLE = """
 :root {
   --bg: #f6f7fb;
   --primary: #3c7dd9;
@@ -326,8 +503,19 @@ a { color: inherit; text-decoration: none; }
   .details li { grid-template-columns: 1fr; }
 }
 """
+STYLE_BYTES = STYLE.encode("utf-8")
+
+
+def write_style() -> None:
     ASSETS_DIR.mkdir(parents=True, exist_ok=True)
-    (ASSETS_DIR / "style.css").write_text(style, encoding="utf-8")
+    (ASSETS_DIR / "style.css").write_bytes(STYLE_BYTES)
+
+
+def write_pages(pages: List[Tuple[Path, Union[bytes, bytearray]]]) -> None:
+    """Write rendered pages concurrently; file writes release the GIL."""
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(lambda page: page[0].write_bytes(page[1]), pages))
 
 
 def write_site() -> None:
@@ -336,13 +524,21 @@ def write_site() -> None:
 
     write_style()
 
-    DOCS_DIR.mkdir(exist_ok=True)
-    (DOCS_DIR / "index.html").write_text(render_index(shops), encoding="utf-8")
+    # Create every output directory up front; the parent exists after the
+    # first call, so the per-shop calls need no ``parents=True`` walk.
+    STORES_DIR.mkdir(parents=True, exist_ok=True)
+    shop_dirs = [STORES_DIR / shop["slug"] for shop in shops]
+    for shop_dir in shop_dirs:
+        shop_dir.mkdir(exist_ok=True)
 
-    for shop in shops:
-        shop_dir = DOCS_DIR / "stores" / shop["slug"]
-        shop_dir.mkdir(parents=True, exist_ok=True)
-        (shop_dir / "index.html").write_text(render_shop_page(shop), encoding="utf-8")
+    # Escape every field once; both page renderers reuse the same view.
+    escaped = [escape_shop(shop) for shop in shops]
+
+    pages: List[Tuple[Path, Union[bytes, bytearray]]] = [(DOCS_DIR / "index.html", render_index(escaped))]
+    for shop, shop_dir in zip(escaped, shop_dirs):
+        pages.append((shop_dir / "index.html", render_shop_page(shop).encode("utf-8")))
+
+    write_pages(pages)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,83 @@
+import pytest
+
+import generate_sites
+
+HEADER = ("google-symbols", "hfpxzc href", "qBF1Pd", "MW4etd", "UY7F9")
+NAMES = ("qBF1Pd", "hfpxzc href", "UY7F9", "missing")
+
+
+@pytest.fixture
+def short_row_csv(tmp_path):
+    path = tmp_path / "shops.csv"
+    path.write_text(",".join(HEADER) + "\nx,https://m/2,Shop B\n", encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def full_rows_csv(tmp_path):
+    path = tmp_path / "shops.csv"
+    path.write_text(
+        ",".join(HEADER) + "\nx,https://m/1,Shop A,4.5,(12)\n,https://m/2,\"Shop, B\",,\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_read_columns_pads_short_rows_stdlib(short_row_csv, monkeypatch):
+    monkeypatch.setattr(generate_sites, "pac", None)
+    columns = generate_sites.read_columns(short_row_csv, NAMES)
+    assert columns == [["Shop B"], ["https://m/2"], [""], [""]]
+
+
+def test_read_columns_pads_short_rows_pyarrow(short_row_csv):
+    pytest.importorskip("pyarrow.csv")
+    columns = generate_sites.read_columns(short_row_csv, NAMES)
+    assert columns == [["Shop B"], ["https://m/2"], [""], [""]]
+
+
+def test_read_columns_pyarrow_matches_stdlib(full_rows_csv, monkeypatch):
+    pytest.importorskip("pyarrow.csv")
+    with monkeypatch.context() as patch:
+        patch.setattr(generate_sites, "pac", None)
+        expected = generate_sites.read_columns(full_rows_csv, NAMES)
+
+    def no_fallback(path):
+        raise AssertionError("pyarrow path fell back to the stdlib reader")
+
+    monkeypatch.setattr(generate_sites, "csv_rows", no_fallback)
+    assert generate_sites.read_columns(full_rows_csv, NAMES) == expected
+    assert expected == [["Shop A", "Shop, B"], ["https://m/1", "https://m/2"], ["(12)", ""], ["", ""]]
+
+
+def test_load_images_skips_rows_without_image(tmp_path, monkeypatch):
+    path = tmp_path / "detail.csv"
+    path.write_text("link,image\nhttps://m/1,https://img/1\nhttps://m/1\n", encoding="utf-8")
+    monkeypatch.setattr(generate_sites, "DETAIL_FILE", path)
+    assert generate_sites.load_images() == {"https://m/1": "https://img/1"}
+
+
+def test_unique_slug_skips_earlier_suffixed_slugs():
+    counters = {}
+    slugs = [generate_sites.unique_slug(name, counters) for name in ["a-2", "a", "a", "a-2"]]
+    assert slugs == ["a-2", "a", "a-3", "a-2-2"]
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "Pet Station",
+        "  padded name  ",
+        "a\x1cb\x1fc",
+        "tab\there\nnewline\r\x0b\x0c",
+        "wow!!! cats & dogs...",
+        "--dash--run---",
+        "mixed_under_score-ok",
+        "!@#$%^&*()",
+        "a - - b",
+        "",
+    ],
+)
+def test_slugify_ascii_table_matches_regex_path(name):
+    expected = generate_sites.SLUG_INVALID_CHARS.sub("", name.strip())
+    expected = generate_sites.SLUG_SEPARATORS.sub("-", expected).strip("-")
+    assert generate_sites.slugify(name) == expected